@@ -0,0 +1,59 @@
+# Copyright 2016, 2023 John J. Rofrano. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pytest configuration for running the suite in parallel
+
+Under pytest the whole suite defaults to in-memory SQLite, which is
+already private to each process, so pytest -n auto works out of the box.
+When DATABASE_URI points at Postgres instead, every pytest-xdist worker
+is redirected to its own database so the workers cannot see each other's
+rows. Serial runs are never redirected.
+"""
+import os
+
+# Set the SQLite default before any test module imports `service`, which
+# connects to the configured database at import time; without this an
+# env-less pytest run would require the Postgres server from config.py
+os.environ.setdefault("DATABASE_URI", "sqlite:///:memory:")
+
+# pylint: disable=wrong-import-position
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+
+def pytest_configure(config):  # pylint: disable=unused-argument
+    """Gives each pytest-xdist worker its own database, creating it if needed"""
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if not worker:
+        return
+    database_uri = os.environ["DATABASE_URI"]
+    if not database_uri.startswith("postgresql"):
+        return  # in-memory SQLite is already private to the worker process
+    base_uri, _, database = database_uri.rpartition("/")
+    worker_database = f"{database}_{worker}"
+    # CREATE DATABASE cannot run in a transaction, and NullPool keeps this
+    # admin connection from lingering and contending with the workers
+    engine = create_engine(
+        database_uri, isolation_level="AUTOCOMMIT", poolclass=NullPool
+    )
+    with engine.connect() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": worker_database},
+        ).scalar()
+        if not exists:
+            connection.execute(text(f'CREATE DATABASE "{worker_database}"'))
+    engine.dispose()
+    os.environ["DATABASE_URI"] = f"{base_uri}/{worker_database}"
@@ -70,7 +70,9 @@ class TestProductRoutes(TestCase):
     def setUp(self):
         """Runs before each test"""
         self.client = app.test_client()
-        db.session.query(Product).delete()  # clean up the last tests
+        # clean up the last tests; skip identity-map bookkeeping since the
+        # session is dropped in tearDown anyway
+        db.session.query(Product).delete(synchronize_session=False)
         db.session.commit()
 
     def tearDown(self):